@@ -6,7 +6,7 @@ PARIS Player/Exporter GUI (minimal-deps)
 - Set tone frequency, sample rate, volume, ramp (fade) time
 - Play audio through system player (platform-dependent, no extra libs)
 - Export to WAV (always)
-- Export to MP3 (if pydub+ffmpeg available)
+- Export to MP3 (if ffmpeg is in PATH)
 
 Author: ChatGPT
 License: MIT
@@ -15,23 +15,103 @@ License: MIT
 import os
 import sys
 import math
-import struct
+import array
+import functools
 import tempfile
 import shutil
 import subprocess
-import threading
+import warnings
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-# Optional MP3 support
+# Optional NumPy acceleration for synthesis (falls back to pure Python)
 try:
-    from pydub import AudioSegment  # requires pydub + ffmpeg in PATH
-    HAVE_PYDUB = True
+    import numpy as np
+    HAVE_NUMPY = True
 except Exception:
-    HAVE_PYDUB = False
+    HAVE_NUMPY = False
+
+# Optional Numba JIT for the synthesis core (needs NumPy)
+try:
+    import numba
+    HAVE_NUMBA = HAVE_NUMPY
+except Exception:
+    HAVE_NUMBA = False
+
+# Q15 sine wavetable for the Numba core, read with linear interpolation.
+# One extra guard sample (== sin(2*pi)) lets index i0+1 wrap without a modulo.
+# The core steps a 32-bit phase accumulator: the top _SIN_LUT_BITS bits
+# index the table and the next 15 bits are the interpolation fraction.
+_SIN_LUT_BITS = 12
+_SIN_LUT_SIZE = 1 << _SIN_LUT_BITS
+_PHASE_INDEX_SHIFT = 32 - _SIN_LUT_BITS
+_PHASE_FRAC_SHIFT = _PHASE_INDEX_SHIFT - 15
+if HAVE_NUMPY:
+    _SIN_LUT_Q15 = np.rint(
+        np.sin(np.linspace(0.0, 2.0 * np.pi, _SIN_LUT_SIZE + 1)) * 32767.0
+    ).astype(np.int16)
 
 def parse_paris(path):
-    """Parse a .paris (CSV) file into list of (duration_ms:int, value:int)."""
+    """Parse a .paris (CSV) file into list of (duration_ms:int, value:int).
+
+    Consecutive rows with the same value are merged into one row, so a
+    tone split across lines plays as one segment (one fade in/out).
+    Results are memoized until the file's mtime or size changes.
+    """
+    st = os.stat(path)
+    return list(_parse_paris_cached(os.path.abspath(path), st.st_mtime_ns, st.st_size))
+
+@functools.lru_cache(maxsize=8)
+def _parse_paris_cached(path, mtime_ns, size):
+    """parse_paris body; mtime_ns and size only key the cache."""
+    rows = _parse_paris_numpy(path) if HAVE_NUMPY else None
+    if rows is None:
+        rows = _parse_paris_lines(path)
+    if not rows:
+        raise ValueError("No timing rows found in file.")
+    return tuple(rows)
+
+def _parse_paris_numpy(path):
+    """Fast parse_paris body via np.loadtxt.
+
+    Returns None if the file has rows loadtxt can't read (wrong column
+    count, non-integer fields); the lenient line parser skips those.
+    """
+    def data_lines(f):
+        # Only whole-line comments are skipped, like the line parser; an
+        # inline '#' makes the row unreadable for loadtxt (comments=None),
+        # so such files fall back to the line parser too
+        for line in f:
+            ln = line.strip()
+            if ln and not ln.startswith('#') and not ln.lower().startswith('duration_ms'):
+                yield ln
+
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            with warnings.catch_warnings():
+                # a file with no data rows is reported by parse_paris instead
+                warnings.simplefilter('ignore', UserWarning)
+                arr = np.loadtxt(data_lines(f), delimiter=',', comments=None,
+                                 dtype=np.int64, ndmin=2)
+        except (ValueError, OverflowError):
+            return None
+    if arr.size == 0:
+        return []
+    if arr.shape[1] != 2:
+        return None
+    arr = arr[arr[:, 0] >= 0]
+    if arr.shape[0] == 0:
+        return []
+    d = arr[:, 0]
+    v = (arr[:, 1] != 0).astype(np.int64)
+    # merge runs of equal values, like the line parser
+    run_starts = np.flatnonzero(np.concatenate(([True], v[1:] != v[:-1])))
+    d = np.add.reduceat(d, run_starts)
+    v = v[run_starts]
+    return list(zip(d.tolist(), v.tolist()))
+
+def _parse_paris_lines(path):
+    """Line-by-line parse_paris body; skips malformed lines."""
     rows = []
     with open(path, 'r', encoding='utf-8') as f:
         for line in f:
@@ -47,56 +127,236 @@ def parse_paris(path):
                 d = int(parts[0])
                 v = int(parts[1])
                 v = 1 if v else 0
-                if d >= 0:
+                if d < 0:
+                    continue
+                if rows and rows[-1][1] == v:
+                    rows[-1] = (rows[-1][0] + d, v)
+                else:
                     rows.append((d, v))
             except Exception:
                 continue
-    if not rows:
-        raise ValueError("No timing rows found in file.")
     return rows
 
-def synthesize_pcm16(rows, freq_hz=700.0, samplerate=44100, volume=0.5, ramp_ms=5.0):
-    """Synthesize PCM16 bytes from timing rows. Returns (bytes, num_samples)."""
-    # Clamp/validate
+# Streaming WAV export synthesizes about this many samples at a time
+# (more only when a single segment is longer)
+_STREAM_BLOCK_SAMPLES = 1 << 16
+
+# Shared zeros for streaming long silences without allocating per segment
+_ZERO_CHUNK = b'\x00' * 65536
+
+# The App keeps its last synthesized PCM for reuse up to this size; longer
+# audio is streamed instead
+PCM_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+def _clamp_params(freq_hz, samplerate, volume, ramp_ms):
+    """Clamp/validate synth params. Returns (freq_hz, samplerate, volume, ramp_samples)."""
     samplerate = int(max(8000, min(192000, samplerate)))
     volume = float(max(0.0, min(1.0, volume)))
     freq_hz = float(max(50.0, min(6000.0, freq_hz)))
     ramp_ms = float(max(0.0, min(50.0, ramp_ms)))
     ramp_samples = int(samplerate * (ramp_ms / 1000.0))
+    return freq_hz, samplerate, volume, ramp_samples
 
-    frames = bytearray()
+def _synthesize_block(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0=0):
+    """PCM16 bytes for rows, whose first sample is absolute sample index t0."""
+    if HAVE_NUMBA:
+        return _synthesize_pcm16_numba(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0)
+    if HAVE_NUMPY:
+        return _synthesize_pcm16_numpy(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0)
+    return _synthesize_pcm16_python(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0)
+
+def synthesize_pcm16(rows, freq_hz=700.0, samplerate=44100, volume=0.5, ramp_ms=5.0):
+    """Synthesize PCM16 bytes from timing rows. Returns (bytes, num_samples)."""
+    params = _clamp_params(freq_hz, samplerate, volume, ramp_ms)
+    seg_lens = _segment_lengths(rows, params[1])
+    return _synthesize_block(rows, seg_lens, *params), sum(seg_lens)
+
+def iter_pcm16(rows, freq_hz=700.0, samplerate=44100, volume=0.5, ramp_ms=5.0,
+               block_samples=_STREAM_BLOCK_SAMPLES):
+    """Yield the synthesize_pcm16 output as PCM16 chunks.
+
+    Consecutive rows are grouped until a chunk holds at least block_samples
+    samples, so memory stays bounded by one block or one segment. Silences
+    of half a _ZERO_CHUNK or more are not synthesized: they are yielded as
+    slices of _ZERO_CHUNK.
+    """
+    params = _clamp_params(freq_hz, samplerate, volume, ramp_ms)
+    seg_lens = _segment_lengths(rows, params[1])
+
+    def long_silence(k):
+        return rows[k][1] != 1 and 2 * seg_lens[k] >= len(_ZERO_CHUNK) // 2
+
+    t0 = 0
+    i = 0
+    while i < len(rows):
+        if long_silence(i):
+            remaining = 2 * seg_lens[i]
+            while remaining:
+                n = min(remaining, len(_ZERO_CHUNK))
+                yield _ZERO_CHUNK[:n]
+                remaining -= n
+            t0 += seg_lens[i]
+            i += 1
+            continue
+        j = i
+        n = 0
+        while j < len(rows) and n < block_samples and not long_silence(j):
+            n += seg_lens[j]
+            j += 1
+        yield _synthesize_block(rows[i:j], seg_lens[i:j], *params, t0)
+        t0 += n
+        i = j
+
+def _synthesize_pcm16_python(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0=0):
+    """Pure-Python synthesize_pcm16 body; params must already be clamped."""
+    # Preallocate the whole (zeroed) buffer: silence costs nothing and
+    # tone samples are written in place
+    samples = array.array('h', [0]) * sum(seg_lens)
     two_pi = 2.0 * math.pi
-    t = 0  # running sample index
-    # We'll build each segment as needed
-    for (dur_ms, val) in rows:
-        seg_len = int(round(samplerate * (dur_ms / 1000.0)))
+    # 2D rotation oscillator: (x, y) = (cos, sin) of the current phase,
+    # rotated by one sample's phase step instead of calling sin per sample
+    dphi = two_pi * freq_hz / samplerate
+    dx = math.cos(dphi)
+    dy = math.sin(dphi)
+    # cosine fade table (as _cosine_ramp), shared by the head (index n)
+    # and tail (index seg_len - n) of every tone segment
+    ramp = [1.0]
+    if ramp_samples > 0:
+        ramp = [0.5 * (1 - math.cos(math.pi * i / ramp_samples)) for i in range(ramp_samples + 1)]
+    amp = volume * 32767.0
+    t = t0  # running sample index
+    for seg_len, (_, val) in zip(seg_lens, rows):
         if seg_len <= 0:
             continue
         if val == 1:
-            # tone
-            for n in range(seg_len):
-                # Apply simple cosine fade-in/out to reduce clicks
-                # Compute envelope multiplier env in [0,1]
-                if ramp_samples > 0:
-                    if n < ramp_samples:
-                        env = 0.5 * (1 - math.cos(math.pi * n / ramp_samples))
-                    elif seg_len - n <= ramp_samples:
-                        k = seg_len - n
-                        env = 0.5 * (1 - math.cos(math.pi * k / ramp_samples))
-                    else:
-                        env = 1.0
-                else:
-                    env = 1.0
-                sample = volume * env * math.sin(two_pi * freq_hz * (t / samplerate))
-                s = int(max(-1.0, min(1.0, sample)) * 32767.0)
-                frames += struct.pack('<h', s)
-                t += 1
-        else:
-            # silence
-            frames += b'\x00\x00' * seg_len
-            t += seg_len
-
-    return bytes(frames), t
+            # tone; reseed from the absolute phase so drift can't accumulate
+            # across segments
+            phase = two_pi * freq_hz * (t / samplerate)
+            x = math.cos(phase)
+            y = math.sin(phase)
+            # Peeled head/body/tail loops: no envelope branch per sample.
+            # volume, env in [0, 1] and |y| <= 1 (to rounding), so samples
+            # are already in range: no clamp needed
+            head_end = min(ramp_samples, seg_len)
+            tail_start = max(head_end, seg_len - ramp_samples)
+            i = t - t0
+            for n in range(head_end):
+                samples[i + n] = int(amp * ramp[n] * y)
+                x, y = x * dx - y * dy, x * dy + y * dx
+            for n in range(head_end, tail_start):
+                samples[i + n] = int(amp * y)
+                x, y = x * dx - y * dy, x * dy + y * dx
+            for n in range(tail_start, seg_len):
+                samples[i + n] = int(amp * ramp[seg_len - n] * y)
+                x, y = x * dx - y * dy, x * dy + y * dx
+        # silence: samples are pre-zeroed
+        t += seg_len
+
+    if sys.byteorder == 'big':
+        samples.byteswap()  # PCM16 WAV data is little-endian
+    return samples.tobytes()
+
+def _segment_lengths(rows, samplerate):
+    """Number of samples for each (duration_ms, value) row."""
+    return [max(0, int(round(samplerate * (dur_ms / 1000.0)))) for (dur_ms, _) in rows]
+
+def _cosine_ramp(ramp_samples):
+    """Cosine fade-in table of ramp_samples+1 points, rising 0 -> 1."""
+    if ramp_samples <= 0:
+        return np.ones(1)
+    return 0.5 * (1 - np.cos(np.pi * np.arange(ramp_samples + 1) / ramp_samples))
+
+def _fill_envelope(env, ramp):
+    """Fill env (one tone segment) with full scale and the head/tail ramps.
+
+    Same shape as the scalar loop: head uses n in [0, r), tail uses
+    k = seg_len - n in [r, 1], and the head wins where the two overlap.
+    """
+    seg_len = env.shape[0]
+    m = min(ramp.shape[0] - 1, seg_len)
+    env[:] = ramp[-1]
+    env[seg_len - m:] = ramp[m:0:-1]
+    env[:m] = ramp[:m]
+
+def _synthesize_pcm16_numpy(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0=0):
+    """Vectorized synthesize_pcm16 body; params must already be clamped."""
+    out = np.zeros(sum(seg_lens), dtype=np.int16)
+    cycles_per_sample = freq_hz / samplerate
+    ramp = _cosine_ramp(ramp_samples)
+    scale = np.float32(volume * 32767.0)
+    t = 0  # running sample index into out
+    for seg_len, (_, val) in zip(seg_lens, rows):
+        if seg_len <= 0:
+            continue
+        if val == 1:
+            # tone: absolute sample index keeps phase continuous across segments.
+            # Reduce to [0, 1) cycles in float64, then take sin in float32:
+            # twice the SIMD lanes, and float32 is exact enough past int16.
+            cyc = cycles_per_sample * (t0 + t + np.arange(seg_len, dtype=np.float64))
+            cyc -= np.floor(cyc)
+            cyc *= 2.0 * np.pi
+            s = np.sin(cyc.astype(np.float32))
+            env = np.empty(seg_len, dtype=np.float32)
+            _fill_envelope(env, ramp)
+            s *= env
+            s *= scale
+            # |volume * env * sin| <= 1, so this never overflows int16
+            out[t:t + seg_len] = np.rint(s, out=s)
+        # silence needs no write: out is pre-zeroed
+        t += seg_len
+
+    return out.astype('<i2', copy=False).tobytes()  # WAV data is little-endian
+
+if HAVE_NUMBA:
+    @numba.njit(cache=True, inline='always')
+    def _tone_sample(t, phase_inc, amp, sin_lut_q15):
+        """Interpolated Q15 sine at absolute sample t, scaled by Q15 amp."""
+        # |amp * s| <= 32767 * 32767, so no clamp is needed
+        phase = (t * phase_inc) & 0xFFFFFFFF
+        i0 = phase >> _PHASE_INDEX_SHIFT
+        frac = (phase >> _PHASE_FRAC_SHIFT) & 0x7FFF
+        a = np.int64(sin_lut_q15[i0])
+        s = a + ((frac * (np.int64(sin_lut_q15[i0 + 1]) - a)) >> 15)
+        return (amp * s + 0x4000) >> 15
+
+    @numba.njit(cache=True, parallel=True, boundscheck=False)
+    def _synth_core(starts, vals, out_i16, sin_lut_q15, ramp_q15, phase_inc, vol_q15, t0):
+        """Fixed-point sample loop; writes tone samples into zeroed out_i16.
+
+        Segment i owns out_i16[starts[i]:starts[i+1]], and phase depends
+        only on the absolute sample index t0 + t, so segments run in parallel.
+        """
+        r = ramp_q15.shape[0] - 1
+        full_amp = (vol_q15 * ramp_q15[r] + 0x4000) >> 15
+        for i in numba.prange(vals.shape[0]):
+            if vals[i] != 1:
+                # silence: out_i16 is pre-zeroed
+                continue
+            start = starts[i]
+            seg_len = starts[i + 1] - start
+            # Peeled head/body/tail loops (same envelope as _fill_envelope)
+            head_end = min(r, seg_len)
+            tail_start = max(head_end, seg_len - r)
+            for n in range(head_end):
+                amp = (vol_q15 * ramp_q15[n] + 0x4000) >> 15
+                out_i16[start + n] = _tone_sample(t0 + start + n, phase_inc, amp, sin_lut_q15)
+            for n in range(head_end, tail_start):
+                out_i16[start + n] = _tone_sample(t0 + start + n, phase_inc, full_amp, sin_lut_q15)
+            for n in range(tail_start, seg_len):
+                amp = (vol_q15 * ramp_q15[seg_len - n] + 0x4000) >> 15
+                out_i16[start + n] = _tone_sample(t0 + start + n, phase_inc, amp, sin_lut_q15)
+
+def _synthesize_pcm16_numba(rows, seg_lens, freq_hz, samplerate, volume, ramp_samples, t0=0):
+    """Numba-backed synthesize_pcm16 body; params must already be clamped."""
+    starts = np.zeros(len(seg_lens) + 1, dtype=np.int64)
+    np.cumsum(seg_lens, out=starts[1:])
+    vals = np.array([v for (_, v) in rows], dtype=np.int64)
+    out = np.zeros(int(starts[-1]), dtype=np.int16)
+    ramp_q15 = np.rint(_cosine_ramp(ramp_samples) * 32767.0).astype(np.int64)
+    phase_inc = int(round(freq_hz / samplerate * (1 << 32)))
+    vol_q15 = int(round(volume * 32767.0))
+    _synth_core(starts, vals, out, _SIN_LUT_Q15, ramp_q15, phase_inc, vol_q15, t0)
+    return out.astype('<i2', copy=False).tobytes()  # WAV data is little-endian
 
 def write_wav(path, pcm_bytes, samplerate=44100, nchannels=1, sampwidth=2):
     import wave
@@ -106,39 +366,99 @@ def write_wav(path, pcm_bytes, samplerate=44100, nchannels=1, sampwidth=2):
         wf.setframerate(samplerate)
         wf.writeframes(pcm_bytes)
 
+def write_wav_chunks(path, chunks, samplerate=44100):
+    """Write an iterable of PCM16 chunks as a mono WAV. Returns num_samples."""
+    import wave
+    nsamples = 0
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)  # 16-bit
+        wf.setframerate(samplerate)
+        for chunk in chunks:
+            # the header's frame count is patched on close
+            wf.writeframesraw(chunk)
+            nsamples += len(chunk) // 2
+    return nsamples
+
+def encode_mp3_ffmpeg(path, chunks, samplerate=44100):
+    """Encode PCM16 chunks to MP3 by piping them into ffmpeg's stdin.
+
+    No temp WAV is written. Returns the number of samples encoded; raises
+    RuntimeError if ffmpeg fails. If producing the chunks fails, ffmpeg is
+    killed and the partial output file removed before re-raising.
+    """
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+           '-f', 's16le', '-ar', str(samplerate), '-ac', '1', '-i', '-',
+           '-codec:a', 'libmp3lame', path]
+    # stderr goes to a temp file so a chatty ffmpeg can't block on a full
+    # pipe while we are still writing stdin
+    with tempfile.TemporaryFile() as errf:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=errf)
+        nsamples = 0
+        try:
+            for chunk in chunks:
+                proc.stdin.write(chunk)
+                nsamples += len(chunk) // 2
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its error is reported below
+        except BaseException:
+            # don't let ffmpeg finish a truncated file on the EOF below
+            proc.kill()
+            proc.wait()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            raise
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        if proc.wait() != 0:
+            errf.seek(0)
+            msg = errf.read().decode('utf-8', 'replace').strip()
+            raise RuntimeError(f"ffmpeg failed (exit {proc.returncode}): {msg}")
+    return nsamples
+
 def which(cmd):
     return shutil.which(cmd) is not None
 
-class PlayerThread(threading.Thread):
+# While the external player is still running past the expected end of
+# playback (startup latency), re-check this often
+PLAY_POLL_MS = 50
+
+class Player:
+    """Non-blocking WAV playback through the platform's audio player."""
     def __init__(self, wav_path):
-        super().__init__(daemon=True)
         self.wav_path = wav_path
         self.proc = None
-        self.stop_requested = False
 
-    def run(self):
+    def start(self):
+        """Start playback and return immediately. False if no player was found."""
         try:
             if sys.platform.startswith('win'):
-                # winsound blocks, but we can stop via PlaySound(None, ...)
+                # async: returns at once, stopped via PlaySound(None, ...)
                 import winsound
-                winsound.PlaySound(self.wav_path, winsound.SND_FILENAME)
+                winsound.PlaySound(self.wav_path,
+                                   winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+                return True
             elif sys.platform == 'darwin':
                 if which('afplay'):
                     self.proc = subprocess.Popen(['afplay', self.wav_path])
-                    self.proc.wait()
             else:
                 # Linux/others: try aplay or paplay
                 if which('aplay'):
                     self.proc = subprocess.Popen(['aplay', self.wav_path])
-                    self.proc.wait()
                 elif which('paplay'):
                     self.proc = subprocess.Popen(['paplay', self.wav_path])
-                    self.proc.wait()
-                else:
-                    # No player found
-                    pass
         except Exception:
             pass
+        return self.proc is not None
+
+    def is_playing(self):
+        """True while the player process runs (always False for winsound)."""
+        return self.proc is not None and self.proc.poll() is None
 
     def stop(self):
         try:
@@ -146,7 +466,7 @@ class PlayerThread(threading.Thread):
                 import winsound
                 winsound.PlaySound(None, 0)
             else:
-                if self.proc and self.proc.poll() is None:
+                if self.is_playing():
                     self.proc.terminate()
         except Exception:
             pass
@@ -159,7 +479,11 @@ class App(tk.Tk):
         self.minsize(700, 520)
 
         self.paris_path = None
-        self.player_thread = None
+        self.rows = None  # parsed timing rows of paris_path
+        self._pcm_cache = None  # (key, pcm) of the last synthesis
+        self.player = None
+        self._play_job = None  # pending Tk after() id for end of playback
+        self._last_wav_seconds = 0.0  # duration written by synthesize_to_wav
         self.tmp_wav = None
 
         frm = ttk.Frame(self, padding=12)
@@ -242,6 +566,8 @@ class App(tk.Tk):
         try:
             rows = parse_paris(path)
             self.paris_path = path
+            self.rows = rows
+            self._pcm_cache = None
             self.var_file.set(path)
             self.btn_play['state'] = 'normal'
             self.log(f"Loaded {len(rows)} rows from: {path}")
@@ -249,6 +575,26 @@ class App(tk.Tk):
             messagebox.showerror("Open failed", f"Could not parse file:\n{e}")
             self.log(f"Error: {e}")
 
+    def _pcm_chunks(self, freq, sr, vol, ramp):
+        """PCM16 chunks for the loaded file, plus the sample rate they use.
+
+        Rows are re-read (memoized by parse_paris), so edits to the file
+        since on_open are picked up. Reuses the last synthesis when the file
+        and params are unchanged (e.g. Play then Export); audio over
+        PCM_CACHE_MAX_BYTES is streamed and not kept.
+        """
+        st = os.stat(self.paris_path)
+        self.rows = parse_paris(self.paris_path)
+        key = (self.paris_path, st.st_mtime_ns, st.st_size, freq, sr, vol, ramp)
+        clamped_sr = _clamp_params(freq, sr, vol, ramp)[1]
+        if self._pcm_cache and self._pcm_cache[0] == key:
+            return [self._pcm_cache[1]], clamped_sr
+        if 2 * sum(_segment_lengths(self.rows, clamped_sr)) > PCM_CACHE_MAX_BYTES:
+            return iter_pcm16(self.rows, freq, sr, vol, ramp), clamped_sr
+        pcm, _ = synthesize_pcm16(self.rows, freq, sr, vol, ramp)
+        self._pcm_cache = (key, pcm)
+        return [pcm], clamped_sr
+
     def synthesize_to_wav(self, out_path):
         if not self.paris_path:
             messagebox.showwarning("No file", "Open a .paris file first.")
@@ -258,18 +604,37 @@ class App(tk.Tk):
             return False
         freq, sr, vol, ramp = params
         try:
-            rows = parse_paris(self.paris_path)
-            pcm, nsamples = synthesize_pcm16(rows, freq, sr, vol, ramp)
-            write_wav(out_path, pcm, sr)
-            self.log(f"WAV written: {out_path} ({nsamples/sr:.2f}s)")
+            chunks, clamped_sr = self._pcm_chunks(freq, sr, vol, ramp)
+            nsamples = write_wav_chunks(out_path, chunks, clamped_sr)
+            self._last_wav_seconds = nsamples / clamped_sr
+            self.log(f"WAV written: {out_path} ({self._last_wav_seconds:.2f}s)")
             return True
         except Exception as e:
             messagebox.showerror("Synthesis failed", f"Could not synthesize audio:\n{e}")
             self.log(f"Error: {e}")
             return False
 
+    def synthesize_to_mp3(self, out_path):
+        """Pipe synthesized PCM straight into ffmpeg (needs ffmpeg in PATH)."""
+        if not self.paris_path:
+            messagebox.showwarning("No file", "Open a .paris file first.")
+            return False
+        params = self.read_params()
+        if not params:
+            return False
+        freq, sr, vol, ramp = params
+        try:
+            chunks, clamped_sr = self._pcm_chunks(freq, sr, vol, ramp)
+            nsamples = encode_mp3_ffmpeg(out_path, chunks, clamped_sr)
+            self.log(f"MP3 written: {out_path} ({nsamples/clamped_sr:.2f}s)")
+            return True
+        except Exception as e:
+            messagebox.showerror("MP3 export failed", f"Could not export MP3:\n{e}")
+            self.log(f"Error: {e}")
+            return False
+
     def on_play(self):
-        if self.player_thread is not None:
+        if self.player is not None:
             return
         # synthesize to temp wav
         try:
@@ -280,39 +645,41 @@ class App(tk.Tk):
                 shutil.rmtree(tmpdir, ignore_errors=True)
                 self.tmp_wav = None
                 return
-            # start player thread
-            self.player_thread = PlayerThread(self.tmp_wav)
-            self.player_thread.start()
+            self.player = Player(self.tmp_wav)
             self.btn_play['state'] = 'disabled'
             self.btn_stop['state'] = 'normal'
+            if not self.player.start():
+                self.log("No audio player found.")
+                self._play_done()
+                return
             self.log("Playing...")
-            # watcher thread to re-enable buttons when done
-            threading.Thread(target=self._wait_end, daemon=True).start()
+            # check back when the audio should have ended; no watcher thread
+            self._play_job = self.after(int(self._last_wav_seconds * 1000), self._check_play)
         except Exception as e:
             messagebox.showerror("Play failed", f"Playback error:\n{e}")
             self.log(f"Error: {e}")
 
-    def _wait_end(self):
-        # Poll thread; when finished, cleanup temp and reset buttons
-        while self.player_thread and self.player_thread.is_alive():
-            self.after(200, lambda: None)
-            # Simple sleep
-            import time
-            time.sleep(0.2)
-        self.after(0, self._play_done)
+    def _check_play(self):
+        if self.player and self.player.is_playing():
+            self._play_job = self.after(PLAY_POLL_MS, self._check_play)
+        else:
+            self._play_done()
 
     def _play_done(self):
+        self._play_job = None
         self.btn_play['state'] = 'normal'
         self.btn_stop['state'] = 'disabled'
         self.log("Playback finished.")
         self.cleanup_tmp()
-        self.player_thread = None
+        self.player = None
 
     def on_stop(self):
-        if self.player_thread:
-            self.player_thread.stop()
+        if self.player:
+            self.player.stop()
             self.log("Stop requested.")
-        # cleaning happens in watcher
+            if self._play_job is not None:
+                self.after_cancel(self._play_job)
+            self._play_done()
 
     def cleanup_tmp(self):
         if self.tmp_wav:
@@ -341,12 +708,11 @@ class App(tk.Tk):
             messagebox.showinfo("Saved", f"WAV saved:\n{out}")
 
     def on_export_mp3(self):
-        if not HAVE_PYDUB:
+        if not which('ffmpeg'):
             messagebox.showwarning(
                 "MP3 not available",
-                "MP3 export needs 'pydub' and 'ffmpeg' installed and in PATH.\n\n"
-                "Tip:\n  pip install pydub\n"
-                "  (and install ffmpeg from your package manager or ffmpeg.org)"
+                "MP3 export needs 'ffmpeg' installed and in PATH.\n\n"
+                "Tip:\n  install ffmpeg from your package manager or ffmpeg.org"
             )
             return
         if not self.paris_path:
@@ -361,21 +727,8 @@ class App(tk.Tk):
         )
         if not out:
             return
-        # We export WAV to temp, then convert to MP3
-        try:
-            tmpdir = tempfile.mkdtemp(prefix="paris2mp3_")
-            tmpwav = os.path.join(tmpdir, "temp.wav")
-            if not self.synthesize_to_wav(tmpwav):
-                shutil.rmtree(tmpdir, ignore_errors=True)
-                return
-            seg = AudioSegment.from_wav(tmpwav)
-            seg.export(out, format="mp3")
-            shutil.rmtree(tmpdir, ignore_errors=True)
-            self.log(f"MP3 saved: {out}")
+        if self.synthesize_to_mp3(out):
             messagebox.showinfo("Saved", f"MP3 saved:\n{out}")
-        except Exception as e:
-            messagebox.showerror("MP3 export failed", f"Could not export MP3:\n{e}")
-            self.log(f"Error: {e}")
 
 def main():
     app = App()